@@ -0,0 +1,12 @@
+"""Prebuilds 'campaign_tables.pkl' from the lookup tables in 'tables.xlsx'.
+
+The app rebuilds the snapshot itself when it's missing or older than the
+workbook, so running this is only needed to avoid paying that on first load:
+
+    python build_tables.py
+"""
+from main import build_tables
+
+
+if __name__ == "__main__":
+    build_tables()
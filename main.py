@@ -1,29 +1,158 @@
+import csv
+import io
 import os
+import pickle
 import random
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from bisect import bisect_right
+from itertools import accumulate, zip_longest
+import numpy as np
 import streamlit as st
-from openpyxl import load_workbook
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # Fall back to the stdlib xlsx reader below
+    CalamineWorkbook = None
 
 
 # --- 1. DEFINITIONS ---
 
-def parse_campaign_data():
-    """Parses 'campaign_data.xlsx' for missions, intensity, duration, and OpFor."""
+DATA_FILE = 'tables.xlsx'
+CAMPAIGN_SHEET, INTENSITY_SHEET, CONTRACT_SHEET = 'campaigns', 'intensity', 'contract'
+TABLES_FILE = 'campaign_tables.pkl'
+# Bump whenever the shape of the parsed tables changes so old snapshots get rebuilt
+TABLES_VERSION = 4
+
+# Module-level generator so hot paths call bound methods instead of random.*
+_rng = random.Random()
+_np_rng = np.random.default_rng()
+
+# Header cells that start a new section within a campaign's column
+SECTION_KEYS = frozenset(("missions", "intensity", "duration", "opfor"))
+
+
+def resolve_data_path(file_name):
+    """Returns the path to a bundled data file, raising if it can't be found."""
     # For Streamlit deployment, it's often safer to use simple paths
-    file_path = 'campaign_data.xlsx'
+    file_path = file_name
 
     # Fallback to local script dir if running locally and file isn't in root
     if not os.path.exists(file_path):
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(script_dir, 'campaign_data.xlsx')
+        file_path = os.path.join(script_dir, file_name)
 
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
-
-    wb = load_workbook(file_path, data_only=True)
-    ws = wb.active
-
+    return file_path
+
+
+def _xlsx_sheet_paths(z):
+    """Maps each sheet name in an open xlsx archive to its worksheet XML part, in tab order."""
+    rels = ET.parse(z.open('xl/_rels/workbook.xml.rels')).getroot()
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels}
+
+    sheet_paths = {}
+    for sheet in ET.parse(z.open('xl/workbook.xml')).getroot().iterfind('{*}sheets/{*}sheet'):
+        rel_id = next(v for k, v in sheet.attrib.items() if k.endswith('}id'))
+        target = targets[rel_id]
+        # Targets are relative to xl/ unless written as absolute package paths
+        sheet_paths[sheet.get('name')] = target[1:] if target.startswith('/') else f"xl/{target}"
+    return sheet_paths
+
+
+def _xlsx_column_index(cell_ref):
+    index = 0
+    for ch in cell_ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + ord(ch.upper()) - 64
+    return index - 1
+
+
+def _xlsx_cell_value(cell, shared_strings):
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        runs = cell.findall('{*}is/{*}t') + cell.findall('{*}is/{*}r/{*}t')
+        return "".join(t.text or "" for t in runs)
+    raw = cell.findtext('{*}v')
+    if raw is None:
+        return None
+    if cell_type == 's':
+        return shared_strings[int(raw)]
+    if cell_type == 'b':
+        return raw == '1'
+    if cell_type == 'n':
+        return float(raw) if any(ch in raw for ch in '.eE') else int(raw)
+    # Formula strings, errors and ISO dates are returned as their text
+    return raw
+
+
+def _xlsx_sheet_rows(z, sheet_path, shared_strings):
+    rows = []
+    for _, el in ET.iterparse(z.open(sheet_path)):
+        if not el.tag.endswith('}row'):
+            continue
+        # Rows and cells with no content are omitted from the XML, so fill the gaps
+        row_number = int(el.get('r', len(rows) + 1))
+        rows.extend([] for _ in range(row_number - 1 - len(rows)))
+        row = []
+        for cell in el.iterfind('{*}c'):
+            value = _xlsx_cell_value(cell, shared_strings)
+            if value is None:
+                # Styled but empty cells are common; the padding below covers them
+                continue
+            col = _xlsx_column_index(cell.get('r')) if cell.get('r') else len(row)
+            row.extend([None] * (col - len(row)))
+            row.append(value)
+        rows.append(row)
+        el.clear()
+
+    width = max((len(row) for row in rows), default=0)
+    return [row + [None] * (width - len(row)) for row in rows]
+
+
+def _xlsx_sheets(file_path):
+    """Reads every sheet of an xlsx using only zipfile and ElementTree.
+
+    Only cached cell values are read; styles, themes and defined names are never parsed.
+    """
+    with zipfile.ZipFile(file_path) as z:
+        shared_strings = []
+        if 'xl/sharedStrings.xml' in z.namelist():
+            for _, el in ET.iterparse(z.open('xl/sharedStrings.xml')):
+                if el.tag.endswith('}si'):
+                    # Plain strings hold one <t>; rich text splits it across <r> runs
+                    runs = el.findall('{*}t') + el.findall('{*}r/{*}t')
+                    shared_strings.append("".join(t.text or "" for t in runs))
+                    el.clear()
+
+        return {name: _xlsx_sheet_rows(z, sheet_path, shared_strings)
+                for name, sheet_path in _xlsx_sheet_paths(z).items()}
+
+
+def read_workbook_sheets(file_path):
+    """Returns {sheet name: rows} for every sheet in one pass, with None for blank cells."""
+    if CalamineWorkbook is not None:
+        wb = CalamineWorkbook.from_path(file_path)
+        # Calamine reports blank cells as empty strings
+        sheets = {
+            name: [[None if v == "" else v for v in row]
+                   for row in wb.get_sheet_by_name(name).to_python(skip_empty_area=False)]
+            for name in wb.sheet_names
+        }
+        wb.close()
+        return sheets
+
+    return _xlsx_sheets(file_path)
+
+
+def parse_campaign_data(rows):
+    """Parses the campaigns sheet for missions, intensity, duration, and OpFor."""
+    # The sheet is laid out one campaign per column, so transpose the rows
     campaign_data = {}
-    for col in ws.iter_cols(values_only=True):
+    for col in zip_longest(*rows):
         campaign_name = col[0]
         if campaign_name is None:
             continue
@@ -37,12 +166,16 @@ def parse_campaign_data():
                 current_key = None
                 continue
 
-            # Identify the start of a new section (Missions, Intensity, Duration, OpFor)
-            clean_val = str(cell_value).strip().lower()
-            if clean_val in ["missions", "intensity", "duration", "opfor"]:
-                current_key = clean_val
-                campaign_dict[current_key] = []
-            elif current_key:
+            # Identify the start of a new section (Missions, Intensity, Duration, OpFor);
+            # numeric cells can never be headers, so skip the string work for them
+            if isinstance(cell_value, str):
+                clean_val = cell_value.strip().lower()
+                if clean_val in SECTION_KEYS:
+                    current_key = clean_val
+                    campaign_dict[current_key] = []
+                    continue
+
+            if current_key:
                 val = cell_value
                 if current_key == "duration" and isinstance(val, (int, float)):
                     val = int(val)
@@ -50,20 +183,21 @@ def parse_campaign_data():
                     val = float(val)
                 campaign_dict[current_key].append(val)
 
-        campaign_data[campaign_name] = campaign_dict
+        # Fill in every section up front so the generator can index without defaults.
+        # Non-numeric OpFor entries are dropped, as they can't scale the PV.
+        opfor = tuple(m for m in campaign_dict.get("opfor", ()) if isinstance(m, (int, float)))
+        campaign_data[campaign_name] = {
+            "missions": tuple(campaign_dict.get("missions") or ("Standard Combat",)),
+            "intensity": tuple(campaign_dict.get("intensity") or ("Standard",)),
+            "duration": tuple(campaign_dict.get("duration") or (1,)),
+            "opfor": opfor or (1.0,)
+        }
     return campaign_data
 
 
-def parse_intensity_data():
-    file_path = 'Intensity calcs.xlsx'
-    if not os.path.exists(file_path):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(script_dir, 'Intensity calcs.xlsx')
-
-    wb = load_workbook(file_path, data_only=True)
-    ws = wb.active
+def parse_intensity_data(rows):
     intensity_lookup = {}
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    for row in rows[1:]:
         if row[0]:
             name = str(row[0]).strip()
             intensity_lookup[name] = {
@@ -76,88 +210,188 @@ def parse_intensity_data():
     return intensity_lookup
 
 
+def _round5(x):
+    # Round half-up to the nearest multiple of 5; inputs are never negative
+    i = int(x + 2.5)
+    return i - i % 5
+
+
+def _round5_vec(x):
+    i = (x + 2.5).astype(np.int64)
+    return i - i % 5
+
+
 def calculate_pay_split(total_pay, duration):
-    possible_splits = []
-    for m in range(0, (total_pay // duration) + 5, 5):
-        total_retainer = m * duration
-        bonus = total_pay - total_retainer
-        if total_retainer >= 0.25 * total_pay and bonus >= 0.25 * total_pay:
-            if bonus % 5 == 0:
-                possible_splits.append((m, bonus))
-    if possible_splits:
-        return random.choice(possible_splits)
+    # Retainers are multiples of 5 covering 25-75% of the pay, i.e. m = 5 * j with
+    # T / (20 * d) <= j <= 3T / (20 * d). The bonus T - m * d is then a multiple of
+    # 5 exactly when the total is, so every j in that range is a valid split.
+    j_lo = -(-total_pay // (20 * duration))
+    j_hi = (3 * total_pay) // (20 * duration)
+    if total_pay % 5 == 0 and j_lo <= j_hi:
+        m = 5 * _rng.randint(j_lo, j_hi)
+        return m, total_pay - m * duration
     m_raw = (total_pay // 2) // duration
-    m_fallback = 5 * round(m_raw / 5)
+    m_fallback = _round5(m_raw)
     bonus_fallback = total_pay - (m_fallback * duration)
     return m_fallback, bonus_fallback
 
 
+def calculate_pay_splits(total_pays, durations):
+    """Vectorised calculate_pay_split over arrays of totals and durations."""
+    j_lo = -(-total_pays // (20 * durations))
+    j_hi = (3 * total_pays) // (20 * durations)
+    valid = (total_pays % 5 == 0) & (j_lo <= j_hi)
+    # Rows without a valid split draw from a dummy span and take the 50/50 fallback
+    span = np.where(valid, j_hi - j_lo + 1, 1)
+    j = j_lo + (_np_rng.random(len(total_pays)) * span).astype(np.int64)
+    retainers = np.where(valid, 5 * j, _round5_vec((total_pays // 2) // durations))
+    return retainers, total_pays - retainers * durations
+
+
 def calculate_scale_pv(intensity_name, intensity_data):
     stats = intensity_data.get(intensity_name.strip(), {})
     scale_min = stats.get('scale_min', 1.0)
     scale_max = stats.get('scale_max', 1.0)
-    multiplier = random.uniform(scale_min, scale_max)
+    multiplier = _rng.uniform(scale_min, scale_max)
     raw_pv = 120 * multiplier
-    return int(5 * round(raw_pv / 5))
+    return _round5(raw_pv)
+
+
+# Monthly mission counts and their cumulative weights for each intensity
+INTENSITY_RULES = {
+    "Very low": ((0, 1), tuple(accumulate([75, 25]))),
+    "Low": ((0, 1), tuple(accumulate([50, 50]))),
+    "Medium": ((0, 1, 2), tuple(accumulate([20, 60, 20]))),
+    "High": ((1, 2, 3), tuple(accumulate([20, 60, 20]))),
+    "Very high": ((2, 3, 4), tuple(accumulate([20, 60, 20])))
+}
 
 
 def get_monthly_mission_count(intensity_name):
-    intensity_rules = {
-        "Very low": {"counts": [0, 1], "weights": [75, 25]},
-        "Low": {"counts": [0, 1], "weights": [50, 50]},
-        "Medium": {"counts": [0, 1, 2], "weights": [20, 60, 20]},
-        "High": {"counts": [1, 2, 3], "weights": [20, 60, 20]},
-        "Very high": {"counts": [2, 3, 4], "weights": [20, 60, 20]}
-    }
-    rule = intensity_rules.get(intensity_name.strip(), intensity_rules["Medium"])
-    return random.choices(rule["counts"], weights=rule["weights"])[0]
+    counts, cum_weights = INTENSITY_RULES.get(intensity_name.strip(), INTENSITY_RULES["Medium"])
+    return counts[bisect_right(cum_weights, _rng.random() * cum_weights[-1])]
 
 
 def generate_mission_schedule(duration, intensity_name, campaign_type, campaign_data):
     schedule = []
-    available_missions = campaign_data.get(campaign_type, {}).get('missions', ["Standard Combat"])
-    last_mission = None
+    available_missions = campaign_data[campaign_type]["missions"]
+    n = len(available_missions)
+    last_idx = -1
+    randrange = _rng.randrange
     for month in range(1, duration + 1):
         count = get_monthly_mission_count(intensity_name)
-        month_missions = []
-        for _ in range(count):
-            valid_choices = [m for m in available_missions if m != last_mission]
-            if not valid_choices:
-                valid_choices = available_missions
-            current_mission = random.choice(valid_choices)
-            month_missions.append(current_mission)
-            last_mission = current_mission
-        schedule.append({"month": month, "count": count, "types": month_missions})
+        if count == 0:
+            month_missions = ()
+        elif n == 1:
+            month_missions = [available_missions[0]] * count
+        else:
+            month_missions = []
+            for _ in range(count):
+                if last_idx < 0:
+                    i = randrange(n)
+                else:
+                    # Draw from every index but the last one picked, without building a filtered list
+                    i = randrange(n - 1)
+                    if i >= last_idx:
+                        i += 1
+                month_missions.append(available_missions[i])
+                last_idx = i
+        schedule.append((month, count, month_missions))
     return schedule
 
 
-def parse_contract_parameters():
-    file_path = 'contract_parameters.xlsx'
-    if not os.path.exists(file_path):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(script_dir, 'contract_parameters.xlsx')
-    wb = load_workbook(file_path, data_only=True)
-    ws = wb.active
+def parse_contract_parameters(rows):
     actors, salvage_terms = [], []
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    for row in rows[1:]:
         if row[0]: actors.append(str(row[0]).strip())
         if row[1]: salvage_terms.append(str(row[1]).strip())
-    return {"actors": actors, "salvage": salvage_terms}
+    return {"actors": tuple(actors), "salvage": tuple(salvage_terms)}
+
 
+def parse_tables():
+    """Parses all three sheets of 'tables.xlsx', opening the workbook only once."""
+    sheets = read_workbook_sheets(resolve_data_path(DATA_FILE))
+    return {
+        "version": TABLES_VERSION,
+        "campaigns": parse_campaign_data(sheets[CAMPAIGN_SHEET]),
+        "intensity": parse_intensity_data(sheets[INTENSITY_SHEET]),
+        "contract": parse_contract_parameters(sheets[CONTRACT_SHEET])
+    }
+
+
+def build_tables():
+    """Parses 'tables.xlsx' and snapshots the result to 'campaign_tables.pkl'."""
+    tables = parse_tables()
+    data_dir = os.path.dirname(resolve_data_path(DATA_FILE))
 
-def generate_random_campaign(campaign_data, intensity_data, contract_params):
+    # Write to a temp file and swap it in, so readers never see a half-written snapshot.
+    # The snapshot is only a cache: if the directory isn't writable, carry on without it.
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=data_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(tables, f, protocol=5)
+        # mkstemp creates the file 0600; keep it readable if the app runs as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(data_dir, TABLES_FILE))
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return tables
+
+
+def load_tables():
+    """Loads the pickled lookup tables, rebuilding them if missing or stale."""
+    data_path = resolve_data_path(DATA_FILE)
+    tables_path = os.path.join(os.path.dirname(data_path), TABLES_FILE)
+
+    if os.path.exists(tables_path):
+        # Editing the workbook after the snapshot was taken makes it stale
+        if os.path.getmtime(tables_path) >= os.path.getmtime(data_path):
+            try:
+                with open(tables_path, 'rb') as f:
+                    tables = pickle.load(f)
+            except Exception:
+                # The snapshot is only a cache; anything unreadable is rebuilt (and replaced) below
+                tables = None
+            if isinstance(tables, dict) and tables.get("version") == TABLES_VERSION:
+                return tables
+
+    return build_tables()
+
+
+def data_mtime():
+    return os.path.getmtime(resolve_data_path(DATA_FILE))
+
+
+# Shared read-only across sessions; cache_resource skips the copy cache_data makes
+# on every hit. The mtime argument only keys the cache so workbook edits reload it,
+# and only the current workbook's entry is kept.
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_all_tables(mtime):
+    tables = load_tables()
+    campaign_types = tuple(tables["campaigns"])
+    return tables["campaigns"], campaign_types, tables["intensity"], tables["contract"]
+
+
+def generate_random_campaign(campaign_data, campaign_types, intensity_data, contract_params):
     # 1. Pick random campaign and core details
-    campaign_type = random.choice(list(campaign_data.keys()))
+    campaign_type = _rng.choice(campaign_types)
     details = campaign_data[campaign_type]
 
-    intensity_name = random.choice(details.get('intensity', ["Standard"]))
-    duration = random.choice(details.get('duration', [1]))
+    intensity_name = _rng.choice(details["intensity"])
+    duration = _rng.choice(details["duration"])
 
     # 2. Pick Employer, Opponent, and Salvage
-    employer = random.choice(contract_params["actors"])
-    remaining_actors = [a for a in contract_params["actors"] if a != employer]
-    opponent = random.choice(remaining_actors)
-    salvage = random.choice(contract_params["salvage"])
+    actors = contract_params["actors"]
+    employer_idx = _rng.randrange(len(actors))
+    employer = actors[employer_idx]
+    # Skip over the employer's index rather than copying the list without it
+    opponent_idx = _rng.randrange(len(actors) - 1)
+    if opponent_idx >= employer_idx:
+        opponent_idx += 1
+    opponent = actors[opponent_idx]
+    salvage = _rng.choice(contract_params["salvage"])
 
     # 3. Get intensity stats
     stats = intensity_data.get(intensity_name.strip(), {})
@@ -169,10 +403,7 @@ def generate_random_campaign(campaign_data, intensity_data, contract_params):
 
     # --- NEW: Calculate OpFor Size ---
     # Get the OpFor multiplier from the spreadsheet for this campaign
-    opfor_multipliers = details.get('opfor', [1.0])
-    # Filter out any non-numeric data that might have leaked in
-    opfor_multipliers = [m for m in opfor_multipliers if isinstance(m, (int, float))]
-    selected_opfor_mult = random.choice(opfor_multipliers) if opfor_multipliers else 1.0
+    selected_opfor_mult = _rng.choice(details["opfor"])
 
     raw_opfor_size = pv_value * selected_opfor_mult
 
@@ -181,14 +412,14 @@ def generate_random_campaign(campaign_data, intensity_data, contract_params):
         raw_opfor_size *= 1.1
 
     # Round to the nearest 5 for digestibility
-    opfor_size = int(5 * round(raw_opfor_size / 5))
+    opfor_size = _round5(raw_opfor_size)
 
     # 5. Adjust Financials by PV and 20% Variance
     base_total_pay = duration * base_monthly_payout
     pv_adjusted_pay = (pv_value / 120) * base_total_pay
-    variance_factor = random.uniform(0.8, 1.2)
+    variance_factor = _rng.uniform(0.8, 1.2)
     final_raw_pay = pv_adjusted_pay * variance_factor
-    digestible_total_pay = int(5 * round(final_raw_pay / 5))
+    digestible_total_pay = _round5(final_raw_pay)
 
     monthly_retainer, bonus = calculate_pay_split(digestible_total_pay, duration)
 
@@ -212,28 +443,154 @@ def generate_random_campaign(campaign_data, intensity_data, contract_params):
         "\nMission Schedule:"
     ]
 
-    for item in mission_schedule:
-        m_text = "mission" if item["count"] == 1 else "missions"
-        line = f"Month {item['month']}: {item['count']} {m_text}"
-        if item["count"] > 0:
-            line += f" ({', '.join(item['types'])})"
-        output.append(line)
+    output.extend(
+        f"Month {month}: {count} {'mission' if count == 1 else 'missions'}"
+        + (f" ({', '.join(types)})" if count else "")
+        for month, count, types in mission_schedule
+    )
 
     return "\n".join(output)
 
 
+def _flatten_options(option_lists):
+    """Packs ragged per-campaign option lists into one flat list plus offsets."""
+    flat, starts, lengths = [], [], []
+    for options in option_lists:
+        starts.append(len(flat))
+        lengths.append(len(options))
+        flat.extend(options)
+    return flat, np.array(starts, dtype=np.int64), np.array(lengths, dtype=np.int64)
+
+
+def build_batch_arrays(campaign_data, campaign_types, intensity_data, contract_params):
+    """Converts the lookup tables into parallel NumPy arrays for batch generation."""
+    details = [campaign_data[c] for c in campaign_types]
+
+    intensity_names, intensity_start, intensity_len = _flatten_options(d["intensity"] for d in details)
+    intensity_stats = [intensity_data.get(name.strip(), {}) for name in intensity_names]
+
+    durations, duration_start, duration_len = _flatten_options(d["duration"] for d in details)
+    opfor_mults, opfor_start, opfor_len = _flatten_options(d["opfor"] for d in details)
+
+    return {
+        "campaign_types": np.array(campaign_types, dtype=object),
+        "intensity_names": np.array(intensity_names, dtype=object),
+        "intensity_start": intensity_start,
+        "intensity_len": intensity_len,
+        "payouts": np.array([stats.get('payout', 0) for stats in intensity_stats], dtype=np.float64),
+        "scale_min": np.array([stats.get('scale_min', 1.0) for stats in intensity_stats], dtype=np.float64),
+        "scale_max": np.array([stats.get('scale_max', 1.0) for stats in intensity_stats], dtype=np.float64),
+        "durations": np.array(durations, dtype=np.int64),
+        "duration_start": duration_start,
+        "duration_len": duration_len,
+        "opfor_mults": np.array(opfor_mults, dtype=np.float64),
+        "opfor_start": opfor_start,
+        "opfor_len": opfor_len,
+        "actors": np.array(contract_params["actors"], dtype=object),
+        "salvage": np.array(contract_params["salvage"], dtype=object)
+    }
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_batch_arrays(mtime):
+    return build_batch_arrays(*load_all_tables(mtime))
+
+
+def _pick_options(starts, lengths, campaign_idx):
+    # One uniform draw per row into that row's slice of the flattened options
+    offsets = (_np_rng.random(len(campaign_idx)) * lengths[campaign_idx]).astype(np.int64)
+    return starts[campaign_idx] + offsets
+
+
+BATCH_COLUMNS = ["Employer", "Opponent", "Campaign", "Intensity", "Duration (months)", "Salvage",
+                 "Retainer (per month)", "Bonus", "Scale PV", "OpFor PV", "Mission schedule"]
+
+
+def generate_random_campaigns(n, campaign_data, batch_arrays):
+    """Generates n campaigns as CSV-ready rows, drawing the numeric fields in bulk."""
+    a = batch_arrays
+
+    # 1. Pick campaigns and their core details
+    campaign_idx = _np_rng.integers(0, len(a["campaign_types"]), n)
+    intensity_idx = _pick_options(a["intensity_start"], a["intensity_len"], campaign_idx)
+    durations = a["durations"][_pick_options(a["duration_start"], a["duration_len"], campaign_idx)]
+    opfor_mults = a["opfor_mults"][_pick_options(a["opfor_start"], a["opfor_len"], campaign_idx)]
+
+    # 2. Employer and a distinct opponent, plus salvage
+    n_actors = len(a["actors"])
+    employer_idx = _np_rng.integers(0, n_actors, n)
+    opponent_idx = _np_rng.integers(0, n_actors - 1, n)
+    opponent_idx += opponent_idx >= employer_idx
+    salvage_idx = _np_rng.integers(0, len(a["salvage"]), n)
+
+    # 3. Scale PV and OpFor size, with the 1.1x bonus for 1-month campaigns
+    pv_values = _round5_vec(120 * _np_rng.uniform(a["scale_min"][intensity_idx], a["scale_max"][intensity_idx]))
+    opfor_sizes = _round5_vec(pv_values * opfor_mults * np.where(durations == 1, 1.1, 1.0))
+
+    # 4. Financials adjusted by PV and 20% variance
+    base_total_pay = durations * a["payouts"][intensity_idx]
+    total_pays = _round5_vec((pv_values / 120) * base_total_pay * _np_rng.uniform(0.8, 1.2, n))
+    retainers, bonuses = calculate_pay_splits(total_pays, durations)
+
+    # 5. Mission schedule and formatting stay per row
+    rows = []
+    for i in range(n):
+        campaign_type = a["campaign_types"][campaign_idx[i]]
+        intensity_name = a["intensity_names"][intensity_idx[i]]
+        duration = int(durations[i])
+        schedule = generate_mission_schedule(duration, intensity_name, campaign_type, campaign_data)
+        rows.append([
+            a["actors"][employer_idx[i]],
+            a["actors"][opponent_idx[i]],
+            campaign_type,
+            intensity_name,
+            duration,
+            a["salvage"][salvage_idx[i]],
+            int(retainers[i]),
+            int(bonuses[i]),
+            int(pv_values[i]),
+            int(opfor_sizes[i]),
+            " | ".join(", ".join(types) or "-" for _, _, types in schedule)
+        ])
+    return rows
+
+
+def campaigns_to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(BATCH_COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
 # --- EXECUTION ---
-st.set_page_config(page_title="BattleTech Campaign Generator")
-st.title("Campaign Generator")
+# `streamlit run` executes this file as __main__, so importing it (as build_tables.py
+# does) only pulls in the definitions above without rendering the page
+if __name__ == "__main__":
+    st.set_page_config(page_title="BattleTech Campaign Generator")
+    st.title("Campaign Generator")
 
-if st.button("Generate New Campaign"):
-    try:
-        all_campaigns = parse_campaign_data()
-        intensity_stats = parse_intensity_data()
-        contract_params = parse_contract_parameters()
+    if st.button("Generate New Campaign"):
+        try:
+            all_campaigns, campaign_types, intensity_stats, contract_params = load_all_tables(data_mtime())
+
+            random_setup = generate_random_campaign(all_campaigns, campaign_types, intensity_stats, contract_params)
+
+            st.text_area("Result", value=random_setup, height=450)
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
+
+    st.divider()
+    batch_size = st.number_input("Campaigns to export", min_value=1, max_value=100000, value=1000, step=100)
+
+    if st.button("Generate Campaign Batch"):
+        try:
+            all_campaigns = load_all_tables(data_mtime())[0]
+            batch_arrays = load_batch_arrays(data_mtime())
 
-        random_setup = generate_random_campaign(all_campaigns, intensity_stats, contract_params)
+            batch_rows = generate_random_campaigns(int(batch_size), all_campaigns, batch_arrays)
 
-        st.text_area("Result", value=random_setup, height=450)
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
\ No newline at end of file
+            st.download_button("Download CSV", data=campaigns_to_csv(batch_rows), file_name="campaigns.csv",
+                               mime="text/csv", on_click="ignore")
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
\ No newline at end of file